@@ -1,15 +1,29 @@
 import streamlit as st
-import difflib
 import base64
 from pathlib import Path
 import streamlit.components.v1 as components
-from typing import Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 import io
+import itertools
+import gzip
+import hashlib
 import logging
+import re
+import threading
 from datetime import datetime
 import requests
-from PIL import Image
-from io import BytesIO
+
+try:
+    # C-backed drop-in replacement for difflib, used when available
+    import cydifflib as difflib
+except ImportError:
+    import difflib
+
+try:
+    # Optional: vectorized hex dump formatting
+    import numpy as np
+except ImportError:
+    np = None
 
 # Configure logging
 logging.basicConfig(
@@ -18,11 +32,113 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so repeated fetches reuse the same connection
+_SESSION = requests.Session()
+
 # Constants
 SUPPORTED_TEXT_EXTENSIONS = {'.c', '.h', '.cpp', '.txt', '.py', '.json', '.yaml', '.yml', '.md', '.css', '.html', '.js'}
 SUPPORTED_BINARY_EXTENSIONS = {'.bin', '.hex'}
+# Extensions without the leading dot, as expected by st.file_uploader
+_UPLOADER_TYPES = tuple(sorted(ext[1:] for ext in SUPPORTED_TEXT_EXTENSIONS | SUPPORTED_BINARY_EXTENSIONS))
 MAX_FILE_SIZE_MB = 10
+MAX_PASTE_LINES = 50_000
+COLLAPSE_THRESHOLD_LINES = 2000  # Combined line count above which unchanged runs are collapsed
+MAX_ALIGNED_LINES = 20_000  # Longest changed region that is aligned with SequenceMatcher
+DIFF_TIMEOUT_SECONDS = 2.0  # Line matching budget before falling back to an unaligned view
+MAX_PENDING_MATCHERS = 8  # Finished but uncollected line matchers kept before pruning
+MAX_HIGHLIGHT_CHARS = 4096  # Longest line pair that gets intra-line highlighting
+MIN_HIGHLIGHT_RATIO = 0.5  # Similarity below which paired lines are not highlighted
+CONTEXT_LINES = 3  # Unchanged lines kept around each change in collapsed diffs
+COMPRESS_THRESHOLD_CHARS = 1_000_000  # Rendered diff size above which the HTML is sent gzipped
+MAX_DIFF_ROWS = 10_000  # Rows rendered per column before the diff is truncated
+# Translation table escaping HTML special characters in diff content
+_HTML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+# Byte translation table mapping non-printable bytes to '.' for hex dump ASCII columns
+_PRINTABLE = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+REQUEST_TIMEOUT_SECONDS = 5
 LOGO_URL = "https://raw.githubusercontent.com/Puneeth-kmp/File-Comparison-Tool/main/Picsart_24-11-10_15-02-57-542.png"
+LOGO_PATH = Path(__file__).with_name("Picsart_24-11-10_15-02-57-542.png")  # Bundled copy of the logo at LOGO_URL
+
+# Static markup shared by every rendered diff. Each side is a <pre> of
+# block-level line spans, which the browser lays out far faster than a table.
+_DIFF_STYLE = """
+<style>
+    .diff-container {
+        display: flex;
+        font-family: 'Monaco', 'Consolas', monospace;
+        border: 1px solid #ddd;
+    }
+    .diff-col { flex: 1; min-width: 0; overflow-x: auto; }
+    .diff-col + .diff-col { border-left: 1px solid #ddd; }
+    .diff-col pre { margin: 0; font-family: inherit; }
+    .diff-col pre > span {
+        display: block;
+        width: max-content;
+        min-width: 100%;
+        min-height: 1.5em;
+        line-height: 1.5em;
+        padding-right: 10px;
+    }
+    .diff-col pre > span::before {
+        content: attr(data-n);
+        display: inline-block;
+        width: 50px;
+        padding-right: 10px;
+        margin-right: 10px;
+        background-color: #f8f9fa;
+        color: #6c757d;
+        text-align: right;
+        user-select: none;
+        border-right: 1px solid #ddd;
+    }
+    .added { background-color: #e6ffe6; }
+    .removed { background-color: #ffe6e6; }
+    .modified { background-color: #fff5b1; }
+    .blank { background-color: #fafafa; }
+    .diff-header { 
+        background-color: #f8f9fa;
+        font-weight: bold;
+        text-align: center;
+        padding: 10px;
+        border-bottom: 2px solid #ddd;
+    }
+    .word-added { background-color: #a6f3a6; }
+    .word-removed { background-color: #f8a6a6; }
+    .word-modified { background-color: #fee090; }
+    .collapsed {
+        background-color: #f1f8ff;
+        color: #6c757d;
+        font-style: italic;
+    }
+    .notice {
+        background-color: #fff3cd;
+        color: #856404;
+        text-align: center;
+        padding: 5px 10px;
+    }
+</style>
+"""
+_DIFF_ORIGINAL_OPEN = '<div class="diff-container"><div class="diff-col"><div class="diff-header">Original File</div><pre>'
+_DIFF_MODIFIED_OPEN = '</pre></div><div class="diff-col"><div class="diff-header">Modified File</div><pre>'
+_DIFF_CLOSE = '</pre></div></div>'
+# Loader for gzip-compressed diff HTML, so large diffs cross the websocket compressed
+_INFLATE_DOCUMENT = """
+<div id="diff-root"></div>
+<script>
+    const root = document.getElementById("diff-root");
+    if ("DecompressionStream" in window) {
+        const bytes = Uint8Array.from(atob("__PAYLOAD__"), c => c.charCodeAt(0));
+        new Response(new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip")))
+            .text()
+            .then(html => { root.innerHTML = html; });
+    } else {
+        root.textContent = "This browser cannot display compressed diffs. Please use a current browser.";
+    }
+</script>
+"""
+# Intra-line highlighting tokens: words, whitespace runs, single punctuation marks
+_WORD_RE = re.compile(r'\w+|\s+|[^\w\s]')
+_BLANK_LINE = '<span class="blank" data-n=""></span>'
 
 class FileComparisonTool:
     def __init__(self):
@@ -33,133 +149,414 @@ class FileComparisonTool:
         }
         
     @staticmethod
-    def load_file_content(file) -> Tuple[Optional[str], Optional[str]]:
+    def load_file_content(file) -> Tuple[Optional[str], int, Optional[str]]:
         """
         Load and validate file content
-        Returns: (content, error_message)
+        Returns: (content, size_bytes, error_message)
         """
+        size_bytes = file.size
         try:
-            # Check file size
-            file_size_mb = len(file.getvalue()) / (1024 * 1024)
-            if file_size_mb > MAX_FILE_SIZE_MB:
-                return None, f"File size exceeds {MAX_FILE_SIZE_MB}MB limit"
+            # Reject oversized uploads before touching their contents
+            if size_bytes > MAX_FILE_SIZE_MB * 1024 * 1024:
+                return None, size_bytes, f"File size exceeds {MAX_FILE_SIZE_MB}MB limit"
             
-            content = file.getvalue().decode("utf-8")
-            return content, None
+            raw = file.getvalue()
+            # Keyed on content, so re-uploads and repeat pairings reuse the result
+            digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+            content = _decode_upload(digest, Path(file.name).suffix.lower(), raw)
+            return content, size_bytes, None
         except UnicodeDecodeError:
-            return None, "File appears to be binary or contains invalid characters"
+            return None, size_bytes, "File appears to be binary or contains invalid characters"
         except Exception as e:
             logger.error(f"Error loading file: {str(e)}")
-            return None, f"Error loading file: {str(e)}"
+            return None, size_bytes, f"Error loading file: {str(e)}"
+
+    @staticmethod
+    def validate_text_content(content: str) -> Optional[str]:
+        """
+        Apply the upload size limit, plus a line limit, to pasted text
+        Returns: error_message, or None if the text can be compared
+        """
+        if len(content.encode("utf-8")) > MAX_FILE_SIZE_MB * 1024 * 1024:
+            return f"Text size exceeds {MAX_FILE_SIZE_MB}MB limit"
+        # Count lines the way the renderer splits them
+        if len(content.splitlines()) > MAX_PASTE_LINES:
+            return f"Text exceeds {MAX_PASTE_LINES:,} line limit"
+        return None
+
+    @staticmethod
+    def files_identical(file1, file2) -> bool:
+        """Check whether two uploaded files have byte-identical content"""
+        return file1.size == file2.size and file1.getvalue() == file2.getvalue()
 
     @staticmethod
     def format_hex_data(data: bytes, bytes_per_line: int = 16) -> str:
         """Format binary data as hex dump"""
-        lines = []
-        for i in range(0, len(data), bytes_per_line):
-            chunk = data[i:i + bytes_per_line]
-            hex_dump = ' '.join(f'{b:02x}' for b in chunk)
-            ascii_dump = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
-            lines.append(f"{i:08x}:  {hex_dump:<{bytes_per_line*3}}  |{ascii_dump}|")
-        return '\n'.join(lines)
+        full_length = len(data) - len(data) % bytes_per_line
+        if np is None or not full_length or len(data) > 0xFFFFFFFF:
+            return '\n'.join(FileComparisonTool.iter_hex_dump(data, bytes_per_line))
+        
+        # Complete lines are laid out by numpy; a trailing partial line is formatted normally
+        parts = [_vectorized_hex_dump(data[:full_length], bytes_per_line)]
+        parts.extend(FileComparisonTool.iter_hex_dump(data[full_length:], bytes_per_line, base_offset=full_length))
+        return '\n'.join(parts)
+
+    @staticmethod
+    def iter_hex_dump(data: bytes, bytes_per_line: int = 16, lines_per_chunk: int = 4096,
+                      base_offset: int = 0) -> Iterator[str]:
+        """
+        Yield the hex dump in newline-joined blocks of lines_per_chunk lines, so
+        only one block's worth of per-line strings is alive at a time
+        """
+        # Fix the padded hex column width once and render the ASCII column in a single pass
+        line_format = f"%08x:  %-{bytes_per_line*3}s  |%s|"
+        ascii_text = data.translate(_PRINTABLE).decode('latin-1')
+        chunk_size = bytes_per_line * lines_per_chunk
+        for offset in range(0, len(data), chunk_size):
+            yield '\n'.join([
+                line_format % (base_offset + i, data[i:i + bytes_per_line].hex(' '), ascii_text[i:i + bytes_per_line])
+                for i in range(offset, min(offset + chunk_size, len(data)), bytes_per_line)
+            ])
 
     def generate_diff_html(self, file1_data: str, file2_data: str) -> str:
-        """Generate HTML for side-by-side diff view with enhanced styling"""
-        html_content = """
-        <style>
-            .diff-container { font-family: 'Monaco', 'Consolas', monospace; }
-            .diff-table { width: 100%; border-collapse: collapse; border: 1px solid #ddd; }
-            .diff-table td { padding: 5px 10px; vertical-align: top; border: 1px solid #ddd; }
-            .line-num { 
-                width: 50px;
-                background-color: #f8f9fa;
-                color: #6c757d;
-                text-align: right;
-                user-select: none;
-                border-right: 1px solid #ddd;
-            }
-            .added { background-color: #e6ffe6; }
-            .removed { background-color: #ffe6e6; }
-            .modified { background-color: #fff5b1; }
-            .diff-header { 
-                background-color: #f8f9fa;
-                font-weight: bold;
-                text-align: center;
-                padding: 10px;
-                border-bottom: 2px solid #ddd;
-            }
-            .word-added { background-color: #a6f3a6; }
-            .word-removed { background-color: #f8a6a6; }
-            .word-modified { background-color: #fee090; }
-        </style>
-        <div class="diff-container">
-        <table class="diff-table">
-            <tr>
-                <th colspan="2" class="diff-header">Original File</th>
-                <th colspan="2" class="diff-header">Modified File</th>
-            </tr>
         """
+        Generate a compressed, self-inflating HTML document for the side-by-side
+        diff view, reusing the result across reruns
+        """
+        try:
+            return _cached_diff_html(content_hash(file1_data), content_hash(file2_data), file1_data, file2_data)
+        except TimeoutError as e:
+            # Render without alignment outside the cache; once the matcher finishes,
+            # a later rerun caches the aligned result
+            logger.warning(f"{str(e)}; showing changed region without alignment")
+            return self.compress_html(self.render_diff_html(file1_data, file2_data, align=False))
+
+    @staticmethod
+    def compress_html(html_content: str) -> str:
+        """
+        Wrap large HTML in a small document that gunzips and mounts it in the
+        browser. Smaller HTML is returned as is, so browsers without
+        DecompressionStream can still show it.
+        """
+        if len(html_content) <= COMPRESS_THRESHOLD_CHARS:
+            return html_content
+        payload = base64.b64encode(gzip.compress(html_content.encode("utf-8"), compresslevel=1)).decode("ascii")
+        return _INFLATE_DOCUMENT.replace("__PAYLOAD__", payload)
+
+    @staticmethod
+    def diff_opcodes(file1_lines: List[str], file2_lines: List[str],
+                     align: bool = True) -> Tuple[List[Tuple[str, int, int, int, int]], bool]:
+        """
+        Compute line-level opcodes, diffing only the region between the
+        common leading and trailing lines (as GNU diff does)
+        Returns: (opcodes, aligned), where aligned is False if the changed
+        region was compared by position instead
+        Raises: TimeoutError while aligning the changed region is still running
+        """
+        len1, len2 = len(file1_lines), len(file2_lines)
+        shortest = min(len1, len2)
         
-        file1_lines = file1_data.splitlines()
-        file2_lines = file2_data.splitlines()
-        line_diff = difflib.ndiff(file1_lines, file2_lines)
+        prefix = 0
+        while prefix < shortest and file1_lines[prefix] == file2_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < shortest - prefix and file1_lines[len1 - 1 - suffix] == file2_lines[len2 - 1 - suffix]:
+            suffix += 1
         
-        line_num1, line_num2 = 1, 1
+        end1, end2 = len1 - suffix, len2 - suffix
+        opcodes = []
+        aligned = True
+        if prefix:
+            opcodes.append(("equal", 0, prefix, 0, prefix))
+        if prefix < end1 or prefix < end2:
+            middle1, middle2 = file1_lines[prefix:end1], file2_lines[prefix:end2]
+            if max(len(middle1), len(middle2)) > MAX_ALIGNED_LINES:
+                logger.warning(f"Changed region exceeds {MAX_ALIGNED_LINES} lines; comparing line by line")
+                matched = FileComparisonTool.positional_opcodes(middle1, middle2)
+                aligned = False
+            else:
+                matched = _match_lines(middle1, middle2) if align else None
+                if not matched:  # Alignment was skipped or failed
+                    matched = [("replace", 0, len(middle1), 0, len(middle2))]
+                    aligned = False
+            opcodes.extend(
+                (tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+                for tag, i1, i2, j1, j2 in matched
+            )
+        if suffix:
+            opcodes.append(("equal", end1, len1, end2, len2))
+        return opcodes, aligned
+
+    @staticmethod
+    def positional_opcodes(file1_lines: List[str], file2_lines: List[str]) -> List[Tuple[str, int, int, int, int]]:
+        """
+        Pair lines by position without aligning them, grouping runs of
+        equal and differing lines into opcodes
+        """
+        len1, len2 = len(file1_lines), len(file2_lines)
+        shortest = min(len1, len2)
+        opcodes = []
+        start = 0
+        while start < shortest:
+            same = file1_lines[start] == file2_lines[start]
+            end = start + 1
+            while end < shortest and (file1_lines[end] == file2_lines[end]) == same:
+                end += 1
+            opcodes.append(("equal" if same else "replace", start, end, start, end))
+            start = end
+        if len1 > shortest:
+            opcodes.append(("delete", shortest, len1, shortest, shortest))
+        if len2 > shortest:
+            opcodes.append(("insert", shortest, shortest, shortest, len2))
+        return opcodes
+
+    @staticmethod
+    def highlight_changes(line1: str, line2: str) -> Tuple[str, str]:
+        """
+        Mark the differing parts of two escaped lines with word-level spans
+        Returns: (line1_html, line2_html)
+        """
+        # Match on the unescaped text so no span can split an entity
+        raw1 = line1.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
+        raw2 = line2.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
+        if len(raw1) + len(raw2) > MAX_HIGHLIGHT_CHARS:
+            return line1, line2
+        # Match word tokens rather than characters; the tokens cover every character
+        tokens1 = _WORD_RE.findall(raw1)
+        tokens2 = _WORD_RE.findall(raw2)
+        matcher = difflib.SequenceMatcher(None, tokens1, tokens2, autojunk=False)
+        # Mostly rewritten lines gain nothing from segment marks; the length-only
+        # bound is checked before the character-count bound
+        if matcher.real_quick_ratio() < MIN_HIGHLIGHT_RATIO or matcher.quick_ratio() < MIN_HIGHLIGHT_RATIO:
+            return line1, line2
         
-        for line in line_diff:
-            tag = line[:2]
-            content = line[2:]
+        parts1, parts2 = [], []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            chunk1 = ''.join(tokens1[i1:i2]).translate(_HTML_ESCAPES)
+            chunk2 = ''.join(tokens2[j1:j2]).translate(_HTML_ESCAPES)
+            if tag == "equal":
+                parts1.append(chunk1)
+                parts2.append(chunk2)
+            elif tag == "replace":
+                parts1.append(f'<span class="word-modified">{chunk1}</span>')
+                parts2.append(f'<span class="word-modified">{chunk2}</span>')
+            elif tag == "delete":
+                parts1.append(f'<span class="word-removed">{chunk1}</span>')
+            else:  # insert
+                parts2.append(f'<span class="word-added">{chunk2}</span>')
+        return ''.join(parts1), ''.join(parts2)
+
+    @staticmethod
+    def render_diff_html(file1_data: str, file2_data: str, align: bool = True) -> str:
+        """Render HTML for side-by-side diff view with enhanced styling"""
+        buffer = io.StringIO()
+        buffer.writelines(FileComparisonTool.iter_diff_html(file1_data, file2_data, align))
+        return buffer.getvalue()
+
+    @staticmethod
+    def iter_diff_html(file1_data: str, file2_data: str, align: bool = True) -> Iterator[str]:
+        """
+        Yield the side-by-side diff HTML in fragments. The original column is
+        streamed line by line; the modified column is buffered until it follows.
+        With align=False the changed region is compared by position. Rows past
+        MAX_DIFF_ROWS are cut off.
+        """
+        # Escape each file in a single pass; the mapping is one-to-one, so the
+        # escaped lines compare exactly like the originals
+        file1_lines = file1_data.translate(_HTML_ESCAPES).splitlines()
+        if file1_data == file2_data:
+            # Identical inputs share one split and need no diffing
+            file2_lines = file1_lines
+            opcodes, aligned = [("equal", 0, len(file1_lines), 0, len(file2_lines))], True
+        else:
+            file2_lines = file2_data.translate(_HTML_ESCAPES).splitlines()
+            opcodes, aligned = FileComparisonTool.diff_opcodes(file1_lines, file2_lines, align)
+        # Large diffs keep only a few lines of context around each change
+        collapse = len(file1_lines) + len(file2_lines) > COLLAPSE_THRESHOLD_LINES
+        
+        yield _DIFF_STYLE
+        if not aligned:
+            yield '<div class="notice">Changed lines could not be aligned and are compared line by line</div>'
+        yield _DIFF_ORIGINAL_OPEN
+        modified_column = [_DIFF_MODIFIED_OPEN]
+        
+        rows = FileComparisonTool.iter_diff_rows(file1_lines, file2_lines, opcodes, aligned, collapse)
+        for original, modified in itertools.islice(rows, MAX_DIFF_ROWS):
+            yield original
+            modified_column.append(modified)
+        if next(rows, None) is not None:
+            marker = f'<span class="collapsed" data-n="">&hellip; diff truncated after {MAX_DIFF_ROWS:,} rows &hellip;</span>'
+            yield marker
+            modified_column.append(marker)
+
+        yield from modified_column
+        yield _DIFF_CLOSE
+
+    @staticmethod
+    def iter_diff_rows(file1_lines: List[str], file2_lines: List[str], opcodes: List[Tuple[str, int, int, int, int]],
+                       aligned: bool, collapse: bool) -> Iterator[Tuple[str, str]]:
+        """Yield (original, modified) line spans for each row of the side-by-side view"""
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == "equal":  # Unchanged lines
+                hidden_start = hidden_end = i2
+                if collapse:
+                    lead = CONTEXT_LINES if i1 > 0 else 0
+                    trail = CONTEXT_LINES if i2 < len(file1_lines) else 0
+                    if i2 - i1 > lead + trail + 1:
+                        hidden_start, hidden_end = i1 + lead, i2 - trail
+                for start, stop in ((i1, hidden_start), (hidden_end, i2)):
+                    if start == hidden_end and hidden_end > hidden_start:
+                        marker = f'<span class="collapsed" data-n="">&hellip; {hidden_end - hidden_start:,} unchanged lines &hellip;</span>'
+                        yield marker, marker
+                    for i in range(start, stop):
+                        content = file1_lines[i]
+                        yield f'<span data-n="{i + 1}">{content}</span>', f'<span data-n="{i - i1 + j1 + 1}">{content}</span>'
+                continue
             
-            if tag == "  ":  # Unchanged line
-                html_content += f"""
-                    <tr>
-                        <td class="line-num">{line_num1}</td>
-                        <td>{content}</td>
-                        <td class="line-num">{line_num2}</td>
-                        <td>{content}</td>
-                    </tr>
-                """
-                line_num1 += 1
-                line_num2 += 1
-                
-            elif tag == "- ":  # Removed line
-                html_content += f"""
-                    <tr>
-                        <td class="line-num">{line_num1}</td>
-                        <td class="removed">{content}</td>
-                        <td class="line-num"></td>
-                        <td></td>
-                    </tr>
-                """
-                line_num1 += 1
+            # Replaced lines pair up side by side; any surplus is a plain removal or addition
+            paired = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+            for k in range(paired):  # Modified lines, with the changed parts marked when aligned
+                content1, content2 = file1_lines[i1 + k], file2_lines[j1 + k]
+                if aligned:
+                    content1, content2 = FileComparisonTool.highlight_changes(content1, content2)
+                yield (f'<span class="modified" data-n="{i1 + k + 1}">{content1}</span>',
+                       f'<span class="modified" data-n="{j1 + k + 1}">{content2}</span>')
+            
+            for i in range(i1 + paired, i2):  # Removed lines
+                yield f'<span class="removed" data-n="{i + 1}">{file1_lines[i]}</span>', _BLANK_LINE
                 
-            elif tag == "+ ":  # Added line
-                html_content += f"""
-                    <tr>
-                        <td class="line-num"></td>
-                        <td></td>
-                        <td class="line-num">{line_num2}</td>
-                        <td class="added">{content}</td>
-                    </tr>
-                """
-                line_num2 += 1
+            for j in range(j1 + paired, j2):  # Added lines
+                yield _BLANK_LINE, f'<span class="added" data-n="{j + 1}">{file2_lines[j]}</span>'
+
+def content_hash(data: str) -> str:
+    """Return a short, stable digest of text content for use as a cache key"""
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+class _LineMatcher(threading.Thread):
+    """Daemon thread computing SequenceMatcher opcodes for two line lists"""
+    def __init__(self, file1_lines: List[str], file2_lines: List[str]):
+        super().__init__(daemon=True)
+        self.file1_lines, self.file2_lines = file1_lines, file2_lines
+        self.opcodes: Optional[List[Tuple[str, int, int, int, int]]] = None
+        self.timed_out = False
+    
+    def run(self):
+        try:
+            self.opcodes = difflib.SequenceMatcher(None, self.file1_lines, self.file2_lines, autojunk=False).get_opcodes()
+        except Exception as e:
+            logger.error(f"Error matching lines: {str(e)}")
+        finally:
+            self.file1_lines = self.file2_lines = None
+
+@st.cache_resource(show_spinner=False)
+def _line_matchers() -> Tuple[Dict[Tuple[int, str, int, str], _LineMatcher], threading.Lock]:
+    """
+    Line matchers by region, shared across reruns and sessions. A matcher that
+    outlives its time budget keeps running; later requests for the same region
+    collect its result instead of starting another one.
+    """
+    return {}, threading.Lock()
+
+def _match_lines(file1_lines: List[str], file2_lines: List[str]) -> Optional[List[Tuple[str, int, int, int, int]]]:
+    """
+    Line-level opcodes from SequenceMatcher, or None if matching failed.
+    Raises TimeoutError while the matcher for this region is still running.
+    """
+    key = (len(file1_lines), content_hash("\n".join(file1_lines)),
+           len(file2_lines), content_hash("\n".join(file2_lines)))
+    matchers, lock = _line_matchers()
+    with lock:
+        matcher = matchers.get(key)
+        if matcher is None:
+            if len(matchers) >= MAX_PENDING_MATCHERS:
+                for stale in [k for k, m in matchers.items() if not m.is_alive()]:
+                    del matchers[stale]
+            matcher = matchers[key] = _LineMatcher(file1_lines, file2_lines)
+            matcher.start()
+    
+    # Wait out the budget once; a matcher that already overran is only polled
+    matcher.join(0 if matcher.timed_out else DIFF_TIMEOUT_SECONDS)
+    if matcher.is_alive():
+        matcher.timed_out = True
+        raise TimeoutError(f"Line matching exceeded {DIFF_TIMEOUT_SECONDS}s")
+    with lock:
+        if matchers.get(key) is matcher:
+            del matchers[key]
+    return matcher.opcodes
+
+def _vectorized_hex_dump(data: bytes, bytes_per_line: int) -> str:
+    """
+    Lay out a hex dump of complete lines as a numpy byte grid, one row per line,
+    matching iter_hex_dump's format exactly
+    """
+    hex_digits = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+    printable = np.frombuffer(_PRINTABLE, dtype=np.uint8)
+    line_count = len(data) // bytes_per_line
+    hex_start = 11  # after "xxxxxxxx:  "
+    ascii_start = hex_start + bytes_per_line * 3 + 2  # after the padded hex column and two spaces
+    
+    grid = np.full((line_count, ascii_start + bytes_per_line + 3), ord(' '), dtype=np.uint8)
+    offsets = np.arange(line_count, dtype=np.uint32) * np.uint32(bytes_per_line)
+    for digit in range(8):
+        grid[:, digit] = hex_digits[(offsets >> np.uint32(4 * (7 - digit))) & np.uint32(15)]
+    grid[:, 8] = ord(':')
+    
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(line_count, bytes_per_line)
+    grid[:, hex_start:hex_start + bytes_per_line * 3:3] = hex_digits[rows >> 4]
+    grid[:, hex_start + 1:hex_start + bytes_per_line * 3:3] = hex_digits[rows & 15]
+    grid[:, ascii_start] = ord('|')
+    grid[:, ascii_start + 1:ascii_start + 1 + bytes_per_line] = printable[rows]
+    grid[:, -2] = ord('|')
+    grid[:, -1] = ord('\n')
+    return grid.tobytes()[:-1].decode('ascii')
 
-        html_content += "</table></div>"
-        return html_content
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_diff_html(hash1: str, hash2: str, _file1_data: str, _file2_data: str) -> str:
+    """
+    Memoized diff rendering keyed on the content hashes of both inputs.
+    Underscore-prefixed arguments are not hashed by Streamlit.
+    """
+    return FileComparisonTool.compress_html(FileComparisonTool.render_diff_html(_file1_data, _file2_data))
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _decode_upload(digest: str, suffix: str, _raw: bytes) -> str:
+    """
+    Convert uploaded bytes to comparable text, memoized on a digest of the bytes.
+    .bin files, and other binary types that are not valid UTF-8, are compared
+    through their hex dumps.
+    """
+    if suffix != '.bin':
+        try:
+            # Text, including ASCII formats such as Intel HEX, is compared line by line as written
+            return _raw.decode("utf-8")
+        except UnicodeDecodeError:
+            if suffix not in SUPPORTED_BINARY_EXTENSIONS:
+                raise
+    return FileComparisonTool.format_hex_data(_raw)
 
-@st.cache_data
-def load_github_image(url: str) -> Optional[Image.Image]:
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_github_image_b64(url: str) -> Optional[str]:
     """
-    Load an image from a GitHub repository with caching
+    Load an image from a GitHub repository as base64 for inline embedding, with caching
     """
     try:
-        response = requests.get(url)
+        response = _SESSION.get(url, timeout=REQUEST_TIMEOUT_SECONDS)
         response.raise_for_status()
-        return Image.open(BytesIO(response.content))
+        return base64.b64encode(response.content).decode()
     except Exception as e:
         logger.error(f"Error loading logo: {str(e)}")
         return None
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_logo_b64() -> Optional[str]:
+    """
+    Load the logo as base64 with caching, from the bundled file when present
+    """
+    try:
+        return base64.b64encode(LOGO_PATH.read_bytes()).decode()
+    except OSError:
+        return load_github_image_b64(LOGO_URL)
+
 def main():
     st.set_page_config(
         page_title="Professional File Comparison Tool",
@@ -204,17 +601,15 @@ def main():
     # Header with logo and title
     col1, col2 = st.columns([3, 1])
     with col1:
-        logo = load_github_image(LOGO_URL)
-        if logo:
+        logo_b64 = load_logo_b64()
+        if logo_b64:
             st.markdown(
                 """
                 <div class="logo-container" style="display: flex; justify-content: center; align-items: center;">
                     <img src="data:image/png;base64,{}" style="width: 30%;">
                     <h1 class="header-text"></h1>
                 </div>
-                """.format(
-                    base64.b64encode(BytesIO(requests.get(LOGO_URL).content).read()).decode()
-                ),
+                """.format(logo_b64),
                 unsafe_allow_html=True
             )
         else:
@@ -240,7 +635,7 @@ def main():
 
         uploaded_files = st.file_uploader(
             "Upload files for comparison",
-            type=[ext[1:] for ext in tool.config['supported_text_extensions'].union(tool.config['supported_binary_extensions'])],
+            type=_UPLOADER_TYPES,
             accept_multiple_files=True,
             help="Upload exactly two files to compare"
         )
@@ -249,28 +644,33 @@ def main():
             if len(uploaded_files) == 2:
                 file1, file2 = uploaded_files
                 
-                # Load and validate files
-                file1_data, error1 = tool.load_file_content(file1)
-                file2_data, error2 = tool.load_file_content(file2)
-
-                if error1 or error2:
-                    if error1:
-                        st.error(f"Error in first file: {error1}")
-                    if error2:
-                        st.error(f"Error in second file: {error2}")
+                # Byte-identical uploads need neither decoding nor diffing
+                if tool.files_identical(file1, file2):
+                    st.success(f"✅ `{file1.name}` and `{file2.name}` are identical ({file1.size / 1024:.1f} KB).")
                 else:
-                    st.success("Files loaded successfully!")
-                    with st.expander("📊 File Information", expanded=True):
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.markdown(f"**File 1:** `{file1.name}`")
-                            st.caption(f"Size: {len(file1.getvalue()) / 1024:.1f} KB")
-                        with col2:
-                            st.markdown(f"**File 2:** `{file2.name}`")
-                            st.caption(f"Size: {len(file2.getvalue()) / 1024:.1f} KB")
-
-                    diff_html = tool.generate_diff_html(file1_data, file2_data)
-                    components.html(diff_html, height=800, scrolling=True)
+                    # Load and validate files
+                    file1_data, size1, error1 = tool.load_file_content(file1)
+                    file2_data, size2, error2 = tool.load_file_content(file2)
+
+                    if error1 or error2:
+                        if error1:
+                            st.error(f"Error in first file: {error1}")
+                        if error2:
+                            st.error(f"Error in second file: {error2}")
+                    else:
+                        st.success("Files loaded successfully!")
+                        with st.expander("📊 File Information", expanded=True):
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                st.markdown(f"**File 1:** `{file1.name}`")
+                                st.caption(f"Size: {size1 / 1024:.1f} KB")
+                            with col2:
+                                st.markdown(f"**File 2:** `{file2.name}`")
+                                st.caption(f"Size: {size2 / 1024:.1f} KB")
+
+                        with st.spinner("Comparing files..."):
+                            diff_html = tool.generate_diff_html(file1_data, file2_data)
+                        components.html(diff_html, height=800, scrolling=True)
             else:
                 st.warning("⚠️ Please upload exactly two files for comparison.")
 
@@ -296,9 +696,20 @@ def main():
             name2 = st.text_input("Label for modified text (optional)", "Modified")
 
         if st.button("🔍 Compare", type="primary", use_container_width=True):
-            if text1 and text2:
-                diff_html = tool.generate_diff_html(text1, text2)
-                components.html(diff_html, height=800, scrolling=True)
+            if text1 and text2 and text1 == text2:
+                st.success(f"✅ `{name1}` and `{name2}` are identical.")
+            elif text1 and text2:
+                error1 = tool.validate_text_content(text1)
+                error2 = tool.validate_text_content(text2)
+                if error1 or error2:
+                    if error1:
+                        st.error(f"Error in {name1}: {error1}")
+                    if error2:
+                        st.error(f"Error in {name2}: {error2}")
+                else:
+                    with st.spinner("Comparing texts..."):
+                        diff_html = tool.generate_diff_html(text1, text2)
+                    components.html(diff_html, height=800, scrolling=True)
             else:
                 st.warning("Please enter text in both fields to compare.")
 